@@ -4,9 +4,14 @@ Populate Firestore with Daily Readings
 Scrapes and stores readings for a 28-day window (7 days back, 21 days forward)
 """
 
+import asyncio
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+
+import aiohttp
+
 from scrapers.usccb_scraper import USCCBScraper
 from firebase_admin import credentials, firestore, initialize_app
 import logging
@@ -28,49 +33,130 @@ except Exception as e:
 
 db = firestore.client()
 
-def populate_readings():
-    """Populate Firestore with 28-day window of readings"""
-
-    scraper = USCCBScraper()
+async def scrape_window(scraper, dates, existing=None):
+    """Scrape all dates concurrently over one shared connection pool"""
+
+    existing = existing or {}
+
+    # Cap per-host concurrency to stay polite to USCCB
+    connector = aiohttp.TCPConnector(limit_per_host=8)
+    async with aiohttp.ClientSession(
+        headers=dict(scraper.session.headers),
+        connector=connector
+    ) as session:
+        tasks = []
+        for d in dates:
+            prior = existing.get(d.isoformat())
+            etag = (prior or {}).get('metadata', {}).get('etag')
+            tasks.append(scraper.scrape_async(session, d, etag=etag, cached_reading=prior))
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fetch_existing(dates):
+    """Load already-stored readings for the window, keyed by ISO date"""
+    existing = {}
+    docs = db.collection('readings') \
+        .where('date', '>=', dates[0].isoformat()) \
+        .where('date', '<=', dates[-1].isoformat()) \
+        .stream()
+    for doc in docs:
+        existing[doc.id] = doc.to_dict()
+    return existing
+
+
+def window_dates():
+    """Dates for the 28-day window (7 days back, 21 days forward)"""
     today = datetime.now().date()
     start_date = today - timedelta(days=7)
     end_date = today + timedelta(days=21)
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def store_results(dates, results, existing=None):
+    """Write scraped readings to Firestore, return (success, failure) counts"""
 
+    existing = existing or {}
     success_count = 0
     failure_count = 0
 
-    logger.info(f"📅 Populating readings from {start_date} to {end_date}")
-    logger.info("=" * 80)
+    # Queue writes through BulkWriter so commits are batched and parallelized
+    bulk_writer = db.bulk_writer()
 
-    current_date = start_date
-    while current_date <= end_date:
+    for current_date, reading in zip(dates, results):
         date_str = current_date.isoformat()
 
-        try:
-            logger.info(f"Processing {date_str}...")
+        if isinstance(reading, Exception):
+            logger.error(f"❌ Error processing {date_str}: {str(reading)}")
+            failure_count += 1
+        elif reading is not None and reading is existing.get(date_str):
+            # 304 Not Modified - the stored copy is already current
+            logger.info(f"⏭️ Unchanged {date_str}")
+            success_count += 1
+        elif reading:
+            # Store in Firestore
+            bulk_writer.set(db.collection('readings').document(date_str), reading)
+
+            logger.info(f"✅ Queued {date_str}")
+            success_count += 1
+        else:
+            logger.error(f"❌ Failed to scrape {date_str}")
+            failure_count += 1
 
-            # Scrape reading
-            reading = scraper.scrape(current_date)
+    # Block until all queued writes have been committed
+    bulk_writer.flush()
 
-            if reading:
-                # Store in Firestore
-                doc_ref = db.collection('readings').document(date_str)
-                doc_ref.set(reading)
+    return success_count, failure_count
 
-                logger.info(f"✅ Successfully stored {date_str}")
-                success_count += 1
-            else:
-                logger.error(f"❌ Failed to scrape {date_str}")
-                failure_count += 1
 
-        except Exception as e:
-            logger.error(f"❌ Error processing {date_str}: {str(e)}")
-            failure_count += 1
+def populate_readings():
+    """Populate Firestore with 28-day window of readings"""
 
-        current_date += timedelta(days=1)
+    scraper = USCCBScraper()
+    dates = window_dates()
+
+    logger.info(f"📅 Populating readings from {dates[0]} to {dates[-1]}")
+    logger.info("=" * 80)
+
+    # Prior readings supply ETags so unchanged dates come back as 304s
+    existing = fetch_existing(dates)
+    results = asyncio.run(scrape_window(scraper, dates, existing))
+    success_count, failure_count = store_results(dates, results, existing)
 
     logger.info("=" * 80)
     logger.info(f"✅ Complete! Success: {success_count}, Failed: {failure_count}")
 
+
+def populate_readings_threaded(max_workers=8):
+    """
+    Thread-based alternative to populate_readings() - same window, but
+    scrapes via the sync path on a ThreadPoolExecutor. requests.Session
+    is safe to share here (urllib3's connection pool is thread-safe).
+    """
+
+    scraper = USCCBScraper()
+    dates = window_dates()
+
+    logger.info(f"📅 Populating readings from {dates[0]} to {dates[-1]} ({max_workers} threads)")
+    logger.info("=" * 80)
+
+    # Prior readings supply ETags so unchanged dates come back as 304s
+    existing = fetch_existing(dates)
+
+    def scrape_one(d):
+        prior = existing.get(d.isoformat())
+        etag = (prior or {}).get('metadata', {}).get('etag')
+        return scraper.scrape(d, etag=etag, cached_reading=prior)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(scrape_one, dates))
+    success_count, failure_count = store_results(dates, results, existing)
+
+    logger.info("=" * 80)
+    logger.info(f"✅ Complete! Success: {success_count}, Failed: {failure_count}")
+
+
 if __name__ == '__main__':
-    populate_readings()
+    if '--threads' in sys.argv[1:]:
+        populate_readings_threaded()
+    else:
+        populate_readings()
@@ -3,14 +3,103 @@ USCCB Daily Readings Scraper
 Scrapes liturgical readings from United States Conference of Catholic Bishops
 """
 
+import asyncio
+import functools
+
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Precompiled pattern used in the hot paragraph loops
+_RE_WS = re.compile(r'\s+')
+
+# (keyword, season) pairs checked in order against the lowercased title
+_SEASON_KEYWORDS = (
+    ('advent', 'Advent'),
+    ('christmas', 'Christmas'),
+    ('lent', 'Lent'),
+    ('ash wednesday', 'Lent'),
+    ('easter', 'Easter'),
+    ('ordinary time', 'Ordinary Time'),
+)
+
+# Default season by month (rough approximation) when the title has no keyword
+_MONTH_SEASONS = {11: 'Advent', 12: 'Advent', 1: 'Christmas', 2: 'Lent', 3: 'Lent', 4: 'Easter'}
+
+_SEASON_COLORS = {
+    'Advent': 'purple',
+    'Christmas': 'white',
+    'Lent': 'purple',
+    'Easter': 'white',
+    'Ordinary Time': 'green'
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _determine_season(title_lower, month):
+    """
+    Determine liturgical season based on title and month
+    Memoized - titles repeat heavily (especially in Ordinary Time)
+    """
+    for keyword, season in _SEASON_KEYWORDS:
+        if keyword in title_lower:
+            return season
+
+    return _MONTH_SEASONS.get(month, 'Ordinary Time')
+
+
+@functools.lru_cache(maxsize=256)
+def _get_liturgical_color(season, feast_day):
+    """
+    Determine liturgical color based on season
+    """
+    if feast_day and ('mary' in feast_day.lower() or 'virgin' in feast_day.lower()):
+        return 'white'
+
+    return _SEASON_COLORS.get(season, 'green')
+
+
+# Only the tags _index_sections() cares about - parsing with this
+# strainer skips head/script/nav and non-div markup entirely. The plain
+# tag-name list is stable across bs4 versions (a (name, attrs) callable
+# would break on bs4 4.13+, which calls match functions with the name
+# only); _index_sections() filters the surviving divs by class anyway.
+_STRAINER = SoupStrainer(['h1', 'h3', 'div'])
+
+# Shared across scraper instances so warm Cloud Function containers reuse
+# the same TCP/TLS connections between invocations
+_shared_session = None
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate',
+    })
+
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def _get_shared_session():
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = _build_session()
+    return _shared_session
+
 
 class USCCBScraper:
     """
@@ -21,18 +110,15 @@ class USCCBScraper:
     BASE_URL = "https://bible.usccb.org/bible/readings"
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-        })
-
-    def scrape(self, date):
+        self.session = _get_shared_session()
+
+    def scrape(self, date, etag=None, cached_reading=None):
         """
         Scrape reading for a specific date
         Args:
             date: datetime.date object
+            etag: ETag from a prior scrape of this date (sent as If-None-Match)
+            cached_reading: prior reading dict, returned as-is on HTTP 304
         Returns:
             dict with reading data or None if failed
         """
@@ -41,35 +127,21 @@ class USCCBScraper:
             date_str = date.strftime('%m%d%y')
             url = f"{self.BASE_URL}/{date_str}.cfm"
 
-            logger.info(f"Scraping USCCB: {url}")
+            logger.debug(f"Scraping USCCB: {url}")
 
-            # Fetch page
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            # Fetch page (conditionally when we have a prior ETag).
+            # Timeout is (connect, read) so a dead host fails fast.
+            headers = {'If-None-Match': etag} if etag else None
+            response = self.session.get(url, timeout=(3.05, 10), headers=headers)
 
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Extract readings
-            reading_data = {
-                'date': date.isoformat(),
-                'liturgicalDate': self._extract_liturgical_info(soup, date),
-                'firstReading': self._extract_reading(soup, 'first'),
-                'psalm': self._extract_psalm(soup),
-                'secondReading': self._extract_reading(soup, 'second'),
-                'gospel': self._extract_reading(soup, 'gospel'),
-                'metadata': {
-                    'source': 'USCCB',
-                    'sourceUrl': url
-                }
-            }
+            # Unchanged since last scrape - skip the download and parse
+            if response.status_code == 304 and cached_reading is not None:
+                logger.info(f"USCCB unchanged for {date} (304 Not Modified)")
+                return cached_reading
 
-            # Validate we got at least gospel and first reading
-            if not reading_data['gospel'] or not reading_data['firstReading']:
-                logger.error(f"Missing required readings for {date}")
-                return None
+            response.raise_for_status()
 
-            return reading_data
+            return self._parse(response.content, date, url, etag=response.headers.get('ETag'))
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error scraping USCCB for {date}: {str(e)}")
@@ -78,27 +150,152 @@ class USCCBScraper:
             logger.error(f"Error scraping USCCB for {date}: {str(e)}")
             return None
 
-    def _extract_liturgical_info(self, soup, date):
+    async def scrape_async(self, session, date, etag=None, cached_reading=None):
         """
-        Extract liturgical season, feast day info
+        Async variant of scrape() for concurrent batch fetches
+        Args:
+            session: aiohttp.ClientSession shared across tasks
+            date: datetime.date object
+            etag: ETag from a prior scrape of this date (sent as If-None-Match)
+            cached_reading: prior reading dict, returned as-is on HTTP 304
+        Returns:
+            dict with reading data or None if failed
         """
         try:
-            # Find liturgical date header (e.g., "Wednesday of the Twenty-seventh Week in Ordinary Time")
-            header = soup.find('h1', class_='page-title')
-            if not header:
-                header = soup.find('h1')
+            date_str = date.strftime('%m%d%y')
+            url = f"{self.BASE_URL}/{date_str}.cfm"
+
+            logger.debug(f"Scraping USCCB: {url}")
+
+            headers = {'If-None-Match': etag} if etag else None
+            async with session.get(url, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 304 and cached_reading is not None:
+                    logger.info(f"USCCB unchanged for {date} (304 Not Modified)")
+                    return cached_reading
+
+                response.raise_for_status()
+                html = await response.read()
+                response_etag = response.headers.get('ETag')
+
+            # Parsing is CPU-bound - run it off the event loop
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._parse, html, date, url, response_etag)
 
+        except aiohttp.ClientError as e:
+            logger.error(f"Network error scraping USCCB for {date}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Error scraping USCCB for {date}: {str(e)}")
+            return None
+
+    def _parse(self, html, date, url, etag=None):
+        """
+        Parse fetched HTML into the reading data structure
+        """
+        # Parse HTML (lxml is the C-backed parser, several times faster
+        # than the pure-Python html.parser on these ~100KB pages)
+        soup = BeautifulSoup(html, 'lxml', parse_only=_STRAINER)
+
+        # Walk the tree once, then hand each extractor its own section
+        title_header, sections = self._index_sections(soup)
+
+        # Extract readings
+        reading_data = {
+            'date': date.isoformat(),
+            'liturgicalDate': self._extract_liturgical_info(title_header, date),
+            'firstReading': self._extract_reading(sections.get('first'), 'first'),
+            'psalm': self._extract_psalm(sections.get('psalm')),
+            'secondReading': self._extract_reading(sections.get('second'), 'second'),
+            'gospel': self._extract_reading(sections.get('gospel'), 'gospel'),
+            'metadata': {
+                'source': 'USCCB',
+                'sourceUrl': url,
+                'etag': etag
+            }
+        }
+
+        # Validate we got at least gospel and first reading
+        if not reading_data['gospel'] or not reading_data['firstReading']:
+            logger.error(f"Missing required readings for {date}")
+            return None
+
+        return reading_data
+
+    def _index_sections(self, soup):
+        """
+        Walk the document once, pairing each reading heading (h3) with the
+        citation (div.address) and content (div.content-body) that follow it
+        Returns:
+            (title_header, sections) where sections maps
+            'first'/'psalm'/'second'/'gospel' to (address, content-body) pairs
+        """
+        sections = {}
+        title_header = None
+        first_h1 = None
+        pending = None
+        last_address = None
+        first_body = None
+        last_body = None
+
+        for el in soup.find_all(['h1', 'h3', 'div']):
+            if el.name == 'h1':
+                if first_h1 is None:
+                    first_h1 = el
+                if title_header is None and 'page-title' in (el.get('class') or []):
+                    title_header = el
+            elif el.name == 'h3':
+                heading = el.get_text(strip=True).lower()
+                if 'responsorial psalm' in heading:
+                    pending = 'psalm'
+                elif 'reading 2' in heading or 'second reading' in heading:
+                    # Second reading only on Sundays/Solemnities
+                    # USCCB uses "Reading 2" or "Second Reading" depending on page
+                    pending = 'second'
+                elif ('gospel' in heading and 'verse before' not in heading
+                        and 'acclamation' not in heading):
+                    # 'Gospel' heading but NOT 'Verse Before the Gospel' or 'Acclamation'
+                    pending = 'gospel'
+                else:
+                    pending = None
+            else:
+                classes = el.get('class') or []
+                if 'address' in classes:
+                    last_address = el
+                elif 'content-body' in classes:
+                    pair = (last_address, el)
+                    if first_body is None:
+                        first_body = pair
+                    last_body = pair
+                    if pending and pending not in sections:
+                        sections[pending] = pair
+                    pending = None
+
+        # First reading is the first content-body on the page
+        sections.setdefault('first', first_body)
+        # Sometimes gospel is last section
+        sections.setdefault('gospel', last_body)
+
+        return title_header or first_h1, sections
+
+    def _extract_liturgical_info(self, header, date):
+        """
+        Extract liturgical season, feast day info
+        """
+        try:
+            # Header is the liturgical date (e.g., "Wednesday of the Twenty-seventh Week in Ordinary Time")
             liturgical_title = header.get_text(strip=True) if header else ""
+            title_lower = liturgical_title.lower()
 
             # Extract day of week
             day_of_week = date.strftime('%A')
 
             # Determine liturgical season (simplified)
-            season = self._determine_season(liturgical_title, date)
+            season = _determine_season(title_lower, date.month)
 
             # Check for feast day
             feast_day = None
-            if 'feast' in liturgical_title.lower() or 'solemnity' in liturgical_title.lower():
+            if 'feast' in title_lower or 'solemnity' in title_lower:
                 feast_day = liturgical_title
 
             return {
@@ -106,7 +303,7 @@ class USCCBScraper:
                 'dayOfWeek': day_of_week,
                 'feastDay': feast_day,
                 'liturgicalTitle': liturgical_title,
-                'color': self._get_liturgical_color(season, feast_day)
+                'color': _get_liturgical_color(season, feast_day)
             }
 
         except Exception as e:
@@ -119,40 +316,19 @@ class USCCBScraper:
                 'color': 'green'
             }
 
-    def _extract_reading(self, soup, reading_type):
+    def _extract_reading(self, section_pair, reading_type):
         """
         Extract a reading (first, second, or gospel)
         """
         try:
-            # Find reading section
-            if reading_type == 'first':
-                section = soup.find('div', class_='content-body')
-            elif reading_type == 'second':
-                # Second reading only on Sundays/Solemnities
-                # USCCB uses "Reading 2" or "Second Reading" depending on page
-                section = soup.find('h3', string=re.compile(r'(Reading 2|Second Reading)', re.I))
-                if not section:
-                    return None
-                section = section.find_next('div', class_='content-body')
-            elif reading_type == 'gospel':
-                # Find 'Gospel' heading but NOT 'Verse Before the Gospel' or 'Acclamation'
-                section = None
-                all_gospel_h3s = soup.find_all('h3', string=re.compile('Gospel', re.I))
-                for h3 in all_gospel_h3s:
-                    h3_text = h3.get_text(strip=True).lower()
-                    if 'verse before' not in h3_text and 'acclamation' not in h3_text:
-                        section = h3.find_next('div', class_='content-body')
-                        break
-                if not section:
-                    # Sometimes gospel is last section
-                    sections = soup.find_all('div', class_='content-body')
-                    section = sections[-1] if sections else None
+            if not section_pair:
+                return None
 
+            citation_elem, section = section_pair
             if not section:
                 return None
 
             # Extract citation (e.g., "Luke 9:57-62")
-            citation_elem = section.find_previous('div', class_='address')
             citation = citation_elem.get_text(strip=True) if citation_elem else ""
 
             # Extract text content
@@ -162,7 +338,7 @@ class USCCBScraper:
             for p in paragraphs:
                 # Clean text (remove verse numbers, extra whitespace)
                 text = p.get_text(separator=' ', strip=True)
-                text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+                text = _RE_WS.sub(' ', text)  # Normalize whitespace
                 if text:
                     text_parts.append(text)
 
@@ -191,22 +367,19 @@ class USCCBScraper:
             logger.warning(f"Error extracting {reading_type} reading: {str(e)}")
             return None
 
-    def _extract_psalm(self, soup):
+    def _extract_psalm(self, section_pair):
         """
         Extract responsorial psalm (special handling for response)
         """
         try:
-            # Find psalm section
-            psalm_header = soup.find('h3', string=re.compile('Responsorial Psalm', re.I))
-            if not psalm_header:
+            if not section_pair:
                 return None
 
-            section = psalm_header.find_next('div', class_='content-body')
+            citation_elem, section = section_pair
             if not section:
                 return None
 
             # Extract citation
-            citation_elem = section.find_previous('div', class_='address')
             citation = citation_elem.get_text(strip=True) if citation_elem else ""
 
             # Extract response (usually first line starting with R.)
@@ -216,10 +389,10 @@ class USCCBScraper:
             paragraphs = section.find_all('p')
             for p in paragraphs:
                 text = p.get_text(separator=' ', strip=True)
-                text = re.sub(r'\s+', ' ', text)
+                text = _RE_WS.sub(' ', text)
 
                 # Check if this is the response line
-                if text.startswith('R.') or text.startswith('℟.'):
+                if text.startswith(('R.', '℟.')):
                     if not response:
                         response = text
                     text_parts.append(text)
@@ -240,50 +413,3 @@ class USCCBScraper:
         except Exception as e:
             logger.warning(f"Error extracting psalm: {str(e)}")
             return None
-
-    def _determine_season(self, liturgical_title, date):
-        """
-        Determine liturgical season based on title and date
-        """
-        title_lower = liturgical_title.lower()
-
-        if 'advent' in title_lower:
-            return 'Advent'
-        elif 'christmas' in title_lower:
-            return 'Christmas'
-        elif 'lent' in title_lower or 'ash wednesday' in title_lower:
-            return 'Lent'
-        elif 'easter' in title_lower:
-            return 'Easter'
-        elif 'ordinary time' in title_lower:
-            return 'Ordinary Time'
-        else:
-            # Default based on month (rough approximation)
-            month = date.month
-            if month in [11, 12]:
-                return 'Advent'
-            elif month in [1]:
-                return 'Christmas'
-            elif month in [2, 3]:
-                return 'Lent'
-            elif month in [4]:
-                return 'Easter'
-            else:
-                return 'Ordinary Time'
-
-    def _get_liturgical_color(self, season, feast_day):
-        """
-        Determine liturgical color based on season
-        """
-        if feast_day and ('mary' in feast_day.lower() or 'virgin' in feast_day.lower()):
-            return 'white'
-
-        season_colors = {
-            'Advent': 'purple',
-            'Christmas': 'white',
-            'Lent': 'purple',
-            'Easter': 'white',
-            'Ordinary Time': 'green'
-        }
-
-        return season_colors.get(season, 'green')
@@ -6,6 +6,14 @@ import hashlib
 import json
 from typing import Dict, Tuple, List
 
+import orjson
+import xxhash
+
+
+# Required keys, checked via set difference (single C-level operation)
+_REQUIRED_FIELDS = frozenset({'date', 'liturgicalDate', 'firstReading', 'gospel', 'metadata'})
+_SECTION_REQUIRED_FIELDS = frozenset({'reference', 'citation', 'text', 'title'})
+
 
 def validate_reading(reading: Dict) -> Tuple[bool, List[str]]:
     """
@@ -15,42 +23,41 @@ def validate_reading(reading: Dict) -> Tuple[bool, List[str]]:
     errors = []
 
     # Check required top-level fields
-    required_fields = ['date', 'liturgicalDate', 'firstReading', 'gospel', 'metadata']
-    for field in required_fields:
-        if field not in reading:
-            errors.append(f"Missing required field: {field}")
+    for field in sorted(_REQUIRED_FIELDS - reading.keys()):
+        errors.append(f"Missing required field: {field}")
 
     # Validate date format
-    if 'date' in reading:
-        try:
-            # Should be ISO format: YYYY-MM-DD
-            date_str = reading['date']
-            if not isinstance(date_str, str) or len(date_str) != 10:
-                errors.append("Invalid date format (expected YYYY-MM-DD)")
-        except:
-            errors.append("Invalid date value")
+    date_str = reading.get('date')
+    if date_str is not None:
+        # Should be ISO format: YYYY-MM-DD
+        if not isinstance(date_str, str) or len(date_str) != 10:
+            errors.append("Invalid date format (expected YYYY-MM-DD)")
 
     # Validate first reading
-    if 'firstReading' in reading and reading['firstReading']:
-        errors.extend(validate_reading_section(reading['firstReading'], 'First Reading'))
+    first_reading = reading.get('firstReading')
+    if first_reading:
+        errors.extend(validate_reading_section(first_reading, 'First Reading'))
 
     # Validate gospel (required)
-    if 'gospel' in reading and reading['gospel']:
-        errors.extend(validate_reading_section(reading['gospel'], 'Gospel'))
+    gospel = reading.get('gospel')
+    if gospel:
+        errors.extend(validate_reading_section(gospel, 'Gospel'))
     else:
         errors.append("Gospel reading is required but missing")
 
     # Validate psalm
-    if 'psalm' in reading and reading['psalm']:
-        errors.extend(validate_psalm_section(reading['psalm']))
+    psalm = reading.get('psalm')
+    if psalm:
+        errors.extend(validate_psalm_section(psalm))
 
     # Validate second reading (optional - only on Sundays/Solemnities)
-    if 'secondReading' in reading and reading['secondReading']:
-        errors.extend(validate_reading_section(reading['secondReading'], 'Second Reading'))
+    second_reading = reading.get('secondReading')
+    if second_reading:
+        errors.extend(validate_reading_section(second_reading, 'Second Reading'))
 
     # Validate liturgical date
-    if 'liturgicalDate' in reading:
-        liturgical = reading['liturgicalDate']
+    liturgical = reading.get('liturgicalDate')
+    if liturgical is not None:
         if not isinstance(liturgical, dict):
             errors.append("liturgicalDate must be an object")
         else:
@@ -68,18 +75,16 @@ def validate_reading_section(section: Dict, name: str) -> List[str]:
     """
     errors = []
 
-    required_fields = ['reference', 'citation', 'text', 'title']
-    for field in required_fields:
-        if field not in section:
-            errors.append(f"{name}: Missing field '{field}'")
-        elif not section[field]:
+    for field in sorted(_SECTION_REQUIRED_FIELDS - section.keys()):
+        errors.append(f"{name}: Missing field '{field}'")
+    for field in _SECTION_REQUIRED_FIELDS & section.keys():
+        if not section[field]:
             errors.append(f"{name}: Field '{field}' is empty")
 
     # Validate text length (should have substantial content)
-    if 'text' in section:
-        text = section['text']
-        if len(text) < 50:
-            errors.append(f"{name}: Text too short ({len(text)} chars)")
+    text = section.get('text')
+    if text and len(text) < 50:
+        errors.append(f"{name}: Text too short ({len(text)} chars)")
 
     return errors
 
@@ -99,38 +104,49 @@ def validate_psalm_section(section: Dict) -> List[str]:
     return errors
 
 
-def calculate_checksum(reading: Dict) -> str:
+# Algorithm identifier stored in reading metadata alongside the checksum
+CHECKSUM_ALGO = 'xxh3_64'
+
+
+def _checksum_content(reading: Dict) -> Dict:
     """
-    Calculate MD5 checksum of reading content
-    Used for cache validation and data integrity
+    Content fields included in the checksum (metadata excluded)
     """
-    try:
-        # Create deterministic JSON representation
-        # Only include content fields, not metadata
-        content = {
-            'date': reading.get('date'),
-            'firstReading': reading.get('firstReading'),
-            'psalm': reading.get('psalm'),
-            'secondReading': reading.get('secondReading'),
-            'gospel': reading.get('gospel'),
-        }
+    return {
+        'date': reading.get('date'),
+        'firstReading': reading.get('firstReading'),
+        'psalm': reading.get('psalm'),
+        'secondReading': reading.get('secondReading'),
+        'gospel': reading.get('gospel'),
+    }
 
-        # Convert to sorted JSON string
-        json_str = json.dumps(content, sort_keys=True, ensure_ascii=False)
 
-        # Calculate MD5 hash
-        checksum = hashlib.md5(json_str.encode('utf-8')).hexdigest()
+def calculate_checksum(reading: Dict) -> str:
+    """
+    Calculate xxh3_64 checksum of reading content
+    Used for cache validation and data integrity (not security),
+    so a fast non-cryptographic hash is appropriate
+    """
+    try:
+        # orjson serializes straight to sorted, compact UTF-8 bytes -
+        # no str intermediate or encode step to pay for
+        json_bytes = orjson.dumps(_checksum_content(reading), option=orjson.OPT_SORT_KEYS)
 
-        return checksum
+        return xxhash.xxh3_64(json_bytes).hexdigest()
 
     except Exception as e:
         # Fallback to simple hash if JSON serialization fails
-        return hashlib.md5(str(reading).encode('utf-8')).hexdigest()
+        return xxhash.xxh3_64(str(reading).encode('utf-8')).hexdigest()
 
 
 def verify_checksum(reading: Dict, expected_checksum: str) -> bool:
     """
     Verify reading data against expected checksum
+    Legacy records carry 32-hex MD5 checksums; current records use xxh3_64
     """
-    actual_checksum = calculate_checksum(reading)
-    return actual_checksum == expected_checksum
+    if len(expected_checksum) == 32:
+        # Legacy MD5 record - reproduce the old serialization exactly
+        json_str = json.dumps(_checksum_content(reading), sort_keys=True, ensure_ascii=False)
+        return hashlib.md5(json_str.encode('utf-8')).hexdigest() == expected_checksum
+
+    return calculate_checksum(reading) == expected_checksum
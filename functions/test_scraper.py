@@ -6,108 +6,194 @@ Tests the scraper with today's date and displays results.
 Usage: python test_scraper.py
 """
 
+import asyncio
+import functools
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
+
+import aiohttp
+
 from scrapers.usccb_scraper import USCCBScraper
-import json
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(levelname)s: %(message)s'
-)
+try:
+    # orjson parses and serializes straight to/from bytes, several times
+    # faster than stdlib json - but keep the harness runnable without it
+    import orjson
+
+    def _json_loads(raw):
+        return orjson.loads(raw)
+
+    def _json_dumps(data, indent=False):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+
+except ImportError:
+    import json
+
+    def _json_loads(raw):
+        return json.loads(raw)
+
+    def _json_dumps(data, indent=False):
+        return json.dumps(data, indent=2 if indent else None).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _get_default_scraper():
+    """One scraper shared by all test calls in this process"""
+    return USCCBScraper()
+
+
+# Fields every scrape result must carry, checked via set operations
+_REQUIRED_FIELDS = frozenset({"date", "firstReading", "gospel"})
+
+# Parsed results for past dates are cached here - readings are immutable
+# once the date has passed, so repeat runs skip the fetch and the parse
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.usccb-cache')
+
+
+def _cache_path(test_date):
+    return os.path.join(CACHE_DIR, f"{test_date.isoformat()}.json")
+
+
+def load_cached_result(test_date):
+    """Return the cached result for a past date, or None"""
+    if test_date >= date.today():
+        return None
+    try:
+        with open(_cache_path(test_date), 'rb') as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_result(test_date, data):
+    """Cache a scrape result for a past date"""
+    if test_date >= date.today() or not data:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(test_date), 'wb') as f:
+            f.write(_json_dumps(data))
+    except OSError:
+        pass
+
+
+# Separator computed once, not per call
+SEPARATOR = "=" * 80
+
+_PREVIEW_CHARS = 200
+
+
+def _preview(text):
+    """Display preview of a reading text, copied only when truncation is needed"""
+    if len(text) <= _PREVIEW_CHARS:
+        return text
+    return text[:_PREVIEW_CHARS] + '...'
+
+
 def print_separator():
     """Print a visual separator"""
-    print("=" * 80)
+    print(SEPARATOR)
 
 
 def print_reading_data(data):
-    """Pretty print reading data"""
+    """Pretty print reading data (built up-front, emitted in one write)"""
     if not data:
         print("❌ No data returned from scraper")
         return
 
-    print_separator()
-    print("📅 SCRAPING RESULTS")
-    print_separator()
+    out = [SEPARATOR, "📅 SCRAPING RESULTS", SEPARATOR]
 
     # Date and liturgical info
-    print(f"\n📆 Date: {data.get('date', 'Unknown')}")
+    out.append(f"\n📆 Date: {data.get('date', 'Unknown')}")
 
     liturgical = data.get('liturgicalDate', {})
     if liturgical:
-        print(f"🎨 Liturgical Season: {liturgical.get('season', 'Unknown')}")
-        print(f"📖 Liturgical Title: {liturgical.get('liturgicalTitle', 'Unknown')}")
-        print(f"🎨 Liturgical Color: {liturgical.get('color', 'Unknown')}")
+        out.append(f"🎨 Liturgical Season: {liturgical.get('season', 'Unknown')}")
+        out.append(f"📖 Liturgical Title: {liturgical.get('liturgicalTitle', 'Unknown')}")
+        out.append(f"🎨 Liturgical Color: {liturgical.get('color', 'Unknown')}")
         if liturgical.get('feastDay'):
-            print(f"✨ Feast Day: {liturgical['feastDay']}")
+            out.append(f"✨ Feast Day: {liturgical['feastDay']}")
 
-    print_separator()
+    out.append(SEPARATOR)
 
     # First Reading
     first_reading = data.get('firstReading')
     if first_reading:
-        print("\n📖 FIRST READING")
-        print(f"Title: {first_reading.get('title', 'Unknown')}")
-        print(f"Reference: {first_reading.get('reference', 'Unknown')}")
-        print(f"Text: {first_reading.get('text', 'Unknown')[:200]}...")
+        out.append("\n📖 FIRST READING")
+        out.append(f"Title: {first_reading.get('title', 'Unknown')}")
+        out.append(f"Reference: {first_reading.get('reference', 'Unknown')}")
+        out.append(f"Text: {_preview(first_reading.get('text', 'Unknown'))}")
     else:
-        print("\n❌ No first reading found")
+        out.append("\n❌ No first reading found")
 
     # Psalm
     psalm = data.get('psalm')
     if psalm:
-        print("\n🎵 RESPONSORIAL PSALM")
-        print(f"Title: {psalm.get('title', 'Unknown')}")
-        print(f"Reference: {psalm.get('reference', 'Unknown')}")
+        out.append("\n🎵 RESPONSORIAL PSALM")
+        out.append(f"Title: {psalm.get('title', 'Unknown')}")
+        out.append(f"Reference: {psalm.get('reference', 'Unknown')}")
         if psalm.get('response'):
-            print(f"Response: {psalm['response']}")
-        print(f"Text: {psalm.get('text', 'Unknown')[:200]}...")
+            out.append(f"Response: {psalm['response']}")
+        out.append(f"Text: {_preview(psalm.get('text', 'Unknown'))}")
     else:
-        print("\n⚠️  No psalm found")
+        out.append("\n⚠️  No psalm found")
 
     # Second Reading (optional)
     second_reading = data.get('secondReading')
     if second_reading:
-        print("\n📖 SECOND READING")
-        print(f"Title: {second_reading.get('title', 'Unknown')}")
-        print(f"Reference: {second_reading.get('reference', 'Unknown')}")
-        print(f"Text: {second_reading.get('text', 'Unknown')[:200]}...")
+        out.append("\n📖 SECOND READING")
+        out.append(f"Title: {second_reading.get('title', 'Unknown')}")
+        out.append(f"Reference: {second_reading.get('reference', 'Unknown')}")
+        out.append(f"Text: {_preview(second_reading.get('text', 'Unknown'))}")
     else:
-        print("\n⚠️  No second reading (weekday - expected)")
+        out.append("\n⚠️  No second reading (weekday - expected)")
 
     # Gospel
     gospel = data.get('gospel')
     if gospel:
-        print("\n✝️  GOSPEL")
-        print(f"Title: {gospel.get('title', 'Unknown')}")
-        print(f"Reference: {gospel.get('reference', 'Unknown')}")
-        print(f"Text: {gospel.get('text', 'Unknown')[:200]}...")
+        out.append("\n✝️  GOSPEL")
+        out.append(f"Title: {gospel.get('title', 'Unknown')}")
+        out.append(f"Reference: {gospel.get('reference', 'Unknown')}")
+        out.append(f"Text: {_preview(gospel.get('text', 'Unknown'))}")
     else:
-        print("\n❌ No gospel found")
+        out.append("\n❌ No gospel found")
 
     # Metadata
     metadata = data.get('metadata', {})
     if metadata:
-        print_separator()
-        print("\n🔍 METADATA")
-        print(f"Source: {metadata.get('source', 'Unknown')}")
-        print(f"Source URL: {metadata.get('sourceUrl', 'Unknown')}")
+        out.append(SEPARATOR)
+        out.append("\n🔍 METADATA")
+        out.append(f"Source: {metadata.get('source', 'Unknown')}")
+        out.append(f"Source URL: {metadata.get('sourceUrl', 'Unknown')}")
 
-    print_separator()
+    out.append(SEPARATOR)
+
+    # One write() instead of ~30 print() syscalls
+    sys.stdout.write('\n'.join(out) + '\n')
+
+
+def _dump_result(path, data):
+    """Write a scrape result to path as indented JSON"""
+    with open(path, 'wb') as f:
+        f.write(_json_dumps(data, indent=True))
 
 
-def test_scraper(test_date=None):
+def test_scraper(test_date=None, scraper=None, refresh=False, verbose=None,
+                 dump_path=None):
     """
     Test the USCCB scraper
 
     Args:
         test_date: date object (defaults to today)
+        scraper: USCCBScraper to reuse (one is created if not given)
+        refresh: bypass the on-disk cache and re-fetch
+        verbose: pretty-print the scraped data (defaults to true on a TTY)
+        dump_path: if given, write the scraped data there as JSON
     """
     if test_date is None:
         test_date = date.today()
@@ -118,53 +204,99 @@ def test_scraper(test_date=None):
 
     try:
         # Initialize scraper
-        scraper = USCCBScraper()
+        if scraper is None:
+            scraper = _get_default_scraper()
         logger.info("✅ Scraper initialized")
 
-        # Scrape data
-        logger.info(f"📡 Fetching readings for {test_date}...")
-        data = scraper.scrape(test_date)
+        # Scrape data (cache first for immutable past dates)
+        data = None if refresh else load_cached_result(test_date)
+        if data is None:
+            logger.info(f"📡 Fetching readings for {test_date}...")
+            data = scraper.scrape(test_date)
+            store_cached_result(test_date, data)
+        else:
+            logger.info(f"💾 Using cached readings for {test_date}")
 
-        # Display results
-        print_reading_data(data)
+        if dump_path and data:
+            _dump_result(dump_path, data)
+            logger.info(f"💾 Dumped result to {dump_path}")
 
-        # Validation
-        if data:
-            required_fields = ['date', 'firstReading', 'gospel']
-            missing = [f for f in required_fields if not data.get(f)]
+        return evaluate_result(data, verbose=verbose)
 
-            if missing:
-                print(f"\n⚠️  Missing required fields: {', '.join(missing)}")
-                return False
+    except Exception:
+        # logger.exception includes the traceback and goes through the
+        # configured handler instead of writing to stderr unconditionally
+        logger.exception("❌ Scraper test FAILED with exception")
+        return False
 
-            print("\n✅ Scraper test PASSED")
-            return True
-        else:
-            print("\n❌ Scraper test FAILED - No data returned")
+
+def evaluate_result(data, verbose=None):
+    """Display and validate a scrape result, return True on pass"""
+    if verbose is None:
+        # Pretty-printing is pure overhead in CI - default it off there
+        verbose = sys.stdout.isatty()
+
+    if verbose:
+        print_reading_data(data)
+
+    if data:
+        missing_keys = _REQUIRED_FIELDS - data.keys()
+        empty_keys = {f for f in _REQUIRED_FIELDS & data.keys() if not data[f]}
+        missing = missing_keys | empty_keys
+
+        if missing:
+            print(f"\n⚠️  Missing required fields: {', '.join(sorted(missing))}")
             return False
 
-    except Exception as e:
-        logger.error(f"❌ Scraper test FAILED with exception: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        print("\n✅ Scraper test PASSED")
+        return True
+    else:
+        print("\n❌ Scraper test FAILED - No data returned")
         return False
 
 
-def test_multiple_dates():
-    """Test scraper with multiple dates"""
-    print("\n🔍 Testing multiple dates...\n")
+async def scrape_dates_async(test_dates, refresh=False):
+    """Scrape all dates concurrently over one shared aiohttp session"""
+    scraper = _get_default_scraper()
+
+    # Cap in-flight requests to stay polite to USCCB
+    semaphore = asyncio.Semaphore(5)
+
+    async with aiohttp.ClientSession(headers=dict(scraper.session.headers)) as session:
+
+        async def scrape_one(test_date):
+            cached = None if refresh else load_cached_result(test_date)
+            if cached is not None:
+                return cached
+            async with semaphore:
+                data = await scraper.scrape_async(session, test_date)
+            store_cached_result(test_date, data)
+            return data
+
+        return await asyncio.gather(*(scrape_one(d) for d in test_dates),
+                                    return_exceptions=True)
+
 
+def default_test_dates():
+    """Dates exercised by the multi-date tests"""
     today = date.today()
-    test_dates = [
+    return [
         today,
         today - timedelta(days=1),  # Yesterday
         today - timedelta(days=7),  # Last week
     ]
 
+
+def report_results(test_dates, data_by_date, verbose=None):
+    """Display and validate each result in order, then print the summary"""
     results = []
-    for test_date in test_dates:
+    for test_date, data in zip(test_dates, data_by_date):
         print(f"\nTesting {test_date.strftime('%B %d, %Y')}...")
-        success = test_scraper(test_date)
+        if isinstance(data, Exception):
+            logger.error(f"❌ Scraper test FAILED with exception: {str(data)}")
+            success = False
+        else:
+            success = evaluate_result(data, verbose=verbose)
         results.append((test_date, success))
         print()
 
@@ -185,13 +317,67 @@ def test_multiple_dates():
     print_separator()
 
 
+def test_multiple_dates(refresh=False, verbose=None):
+    """Test scraper with multiple dates (fetched concurrently)"""
+    print("\n🔍 Testing multiple dates...\n")
+
+    test_dates = default_test_dates()
+
+    # Fire all fetches at once; display and validate in order afterwards
+    data_by_date = asyncio.run(scrape_dates_async(test_dates, refresh=refresh))
+    report_results(test_dates, data_by_date, verbose=verbose)
+
+
+def test_multiple_dates_threaded(refresh=False, verbose=None):
+    """
+    Thread-based alternative to test_multiple_dates() - same dates, but
+    fetched through the sync scrape() on a ThreadPoolExecutor, leaving
+    the scraper internals untouched
+    """
+    print("\n🔍 Testing multiple dates (threaded)...\n")
+
+    test_dates = default_test_dates()
+    scraper = _get_default_scraper()
+
+    def scrape_one(test_date):
+        cached = None if refresh else load_cached_result(test_date)
+        if cached is not None:
+            return cached
+        data = scraper.scrape(test_date)
+        store_cached_result(test_date, data)
+        return data
+
+    with ThreadPoolExecutor(max_workers=min(8, len(test_dates))) as executor:
+        data_by_date = list(executor.map(scrape_one, test_dates))
+    report_results(test_dates, data_by_date, verbose=verbose)
+
+
 if __name__ == "__main__":
-    import sys
+    # Configure logging only when run as a script, so importing this
+    # module doesn't reconfigure the root logger
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(levelname)s: %(message)s'
+    )
 
     # Check for command line arguments
-    if len(sys.argv) > 1 and sys.argv[1] == "--multiple":
-        test_multiple_dates()
+    args = sys.argv[1:]
+    refresh = "--refresh" in args
+    verbose = False if "--quiet" in args else None
+    dump_path = None
+    if "--dump" in args:
+        dump_index = args.index("--dump")
+        if dump_index + 1 >= len(args):
+            print("Usage: python test_scraper.py [--dump PATH] ...")
+            sys.exit(2)
+        dump_path = args[dump_index + 1]
+
+    if "--multiple" in args:
+        if "--threads" in args:
+            test_multiple_dates_threaded(refresh=refresh, verbose=verbose)
+        else:
+            test_multiple_dates(refresh=refresh, verbose=verbose)
     else:
         # Test today's date
-        success = test_scraper()
+        success = test_scraper(refresh=refresh, verbose=verbose, dump_path=dump_path)
         sys.exit(0 if success else 1)